@@ -0,0 +1,147 @@
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+METRICS = ["Covers", "Bookings"]
+
+# Baseline = the same weekday over the previous WINDOW_WEEKS weeks
+WINDOW_WEEKS = 8
+MIN_PERIODS = 3
+
+# |robust z| above this is flagged (Iglewicz & Hoaglin's 3.5 cut-off)
+Z_THRESHOLD = 3.5
+
+# MAD of a very steady weekday can be ~0; floor the scale so small wobbles
+# don't turn into huge z-scores
+MIN_SCALE_FRACTION = 0.05
+MIN_SCALE = 1.0
+
+
+def robust_z(values: np.ndarray, first_weekday: int, window: int = WINDOW_WEEKS,
+             min_periods: int = MIN_PERIODS) -> tuple:
+    """Median/MAD z-score of each day against the same weekday in the preceding weeks.
+
+    values is one value per consecutive calendar day starting on first_weekday
+    (Mon=0). The series is laid out as a weeks x 7 grid so every day's history
+    window is a strided view, and all baselines come out of one nanmedian call.
+    Returns (baseline, z) arrays aligned with values; NaN where history is short.
+    """
+    n = len(values)
+    n_weeks = -(-(first_weekday + n) // 7)
+    grid = np.full(n_weeks * 7, np.nan)
+    grid[first_weekday:first_weekday + n] = values
+    grid = grid.reshape(n_weeks, 7)
+
+    # Row i of the padded grid's window view covers grid rows i-window .. i-1
+    padded = np.vstack([np.full((window, 7), np.nan), grid])
+    history = sliding_window_view(padded, window, axis=0)[:n_weeks]
+
+    counts = np.sum(~np.isnan(history), axis=-1)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        baseline = np.nanmedian(history, axis=-1)
+        mad = np.nanmedian(np.abs(history - baseline[..., None]), axis=-1)
+
+    scale = np.maximum(1.4826 * mad, np.maximum(MIN_SCALE_FRACTION * np.abs(baseline), MIN_SCALE))
+    z = (grid - baseline) / scale
+
+    short = counts < min_periods
+    baseline[short] = np.nan
+    z[short] = np.nan
+
+    flat = slice(first_weekday, first_weekday + n)
+    return baseline.reshape(-1)[flat], z.reshape(-1)[flat]
+
+def score_daily(daily: pd.DataFrame, window: int = WINDOW_WEEKS, threshold: float = Z_THRESHOLD) -> pd.DataFrame:
+    """Anomaly table for a consecutive daily frame (Date, Bookings, Covers), one row per day"""
+    out = daily[["Date"] + METRICS].reset_index(drop=True).copy()
+    if out.empty:
+        for metric in METRICS:
+            out[f"{metric}_baseline"] = []
+            out[f"{metric}_z"] = []
+            out[f"{metric}_anomaly"] = []
+        out["Anomaly"] = []
+        return out
+
+    first_weekday = int(out["Date"].iloc[0].weekday())
+    flags = []
+    for metric in METRICS:
+        baseline, z = robust_z(out[metric].to_numpy(dtype=float), first_weekday, window)
+        out[f"{metric}_baseline"] = baseline
+        out[f"{metric}_z"] = z
+        out[f"{metric}_anomaly"] = np.abs(np.nan_to_num(z)) > threshold
+        flags.append(out[f"{metric}_anomaly"])
+    out["Anomaly"] = np.logical_or.reduce(flags)
+    return out
+
+def first_changed_row(old: pd.DataFrame, new: pd.DataFrame):
+    """Index of the first day that differs between two daily frames, or None if identical"""
+    if old is None or old.empty or new.empty or old["Date"].iloc[0] != new["Date"].iloc[0]:
+        return 0
+    n = min(len(old), len(new))
+    diff = np.zeros(n, dtype=bool)
+    for metric in METRICS:
+        diff |= old[metric].to_numpy()[:n] != new[metric].to_numpy()[:n]
+    if diff.any():
+        return int(np.argmax(diff))
+    if len(old) != len(new):
+        return n
+    return None
+
+
+class AnomalyDetector:
+    """Keeps the last scored history and re-scores only what new data can affect.
+
+    A day's score depends only on itself and earlier days, so when files change
+    everything before the first changed day is kept and the rest is re-scored
+    with WINDOW_WEEKS of preceding context.
+    """
+
+    def __init__(self, window: int = WINDOW_WEEKS, threshold: float = Z_THRESHOLD):
+        self.window = window
+        self.threshold = threshold
+        self.last_rescored = 0
+        self._daily = None
+        self._result = None
+        self._lock = threading.Lock()
+
+    def update(self, daily: pd.DataFrame) -> pd.DataFrame:
+        daily = daily.reset_index(drop=True)
+        with self._lock:
+            start = first_changed_row(self._daily, daily)
+            if start is None and self._result is not None:
+                self.last_rescored = 0
+                return self._result
+
+            if not start:
+                result = score_daily(daily, self.window, self.threshold)
+            else:
+                context = max(0, start - 7 * self.window)
+                tail = score_daily(daily.iloc[context:], self.window, self.threshold)
+                result = pd.concat(
+                    [self._result.iloc[:start], tail.iloc[start - context:]],
+                    ignore_index=True,
+                )
+
+            self.last_rescored = len(daily) - (start or 0)
+            self._daily = daily
+            self._result = result
+            return result
+
+def describe_anomalies(anomalies: pd.DataFrame) -> list:
+    """One line per flagged day, e.g. '2025-11-12 (Wednesday): 45 covers vs typical 290 (z=-4.1, low)'"""
+    lines = []
+    for r in anomalies[anomalies["Anomaly"]].itertuples():
+        parts = []
+        for metric in METRICS:
+            if getattr(r, f"{metric}_anomaly"):
+                z = getattr(r, f"{metric}_z")
+                parts.append(
+                    f"{int(getattr(r, metric))} {metric.lower()} vs typical {getattr(r, f'{metric}_baseline'):.0f} "
+                    f"(z={z:+.1f}, {'high' if z > 0 else 'low'})"
+                )
+        lines.append(f"{r.Date.date()} ({r.Date.day_name()}): " + "; ".join(parts))
+    return lines
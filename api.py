@@ -0,0 +1,276 @@
+"""Read-only local JSON API over the dashboard aggregates.
+
+    python api.py --port 8502
+
+Endpoints (all GET, scoped with ?month=2025-10 | ?month=October 2025 | ?start=YYYY-MM-DD&end=YYYY-MM-DD):
+
+    /api/months     months available
+    /api/summary    totals plus top_summary (busiest days / slots)
+    /api/calendar   daily bookings and covers
+    /api/weekly     time slot x day-of-week grid (?metric=Covers|Bookings)
+    /api/sources    covers and bookings by source
+
+Responses carry a content ETag and honour If-None-Match (304), and are
+gzip-compressed when the client accepts it. Bodies are cached per query
+and data fingerprint, so repeat polls never touch pandas.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+
+from pipeline import MONTH_FILES, daily_metrics_df, load_all_months, month_fingerprints, top_summary, weekly_pivot
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8502
+
+# Bodies smaller than this aren't worth compressing
+GZIP_MIN_BYTES = 512
+
+# Longest ?start/?end span served; keeps calendar bodies (and the response cache) bounded
+MAX_RANGE_DAYS = 3660
+
+
+def parse_day(value: str) -> pd.Timestamp:
+    """Calendar day of a ?start/?end value; any time of day or UTC offset is dropped"""
+    ts = pd.Timestamp(value)
+    if pd.isna(ts):
+        return ts
+    # Dates are local wall-clock days, so keep the day as written rather than converting to UTC
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    return ts.normalize()
+
+def select_scope(df: pd.DataFrame, params: dict) -> tuple:
+    """Filter the combined frame by ?month or ?start/?end; returns (frame, scope description)"""
+    if "month" in params:
+        try:
+            period = pd.Period(params["month"], freq="M")
+        except ValueError:
+            raise ValueError(f"Invalid month: {params['month']}")
+        scoped = df[df["Date"].dt.to_period("M") == period]
+        return scoped, {"month": str(period), "start": str(period.start_time.date()), "end": str(period.end_time.date())}
+
+    try:
+        start = parse_day(params["start"]) if "start" in params else df["Date"].min()
+        end = parse_day(params["end"]) if "end" in params else df["Date"].max()
+    except (TypeError, ValueError):
+        raise ValueError("Invalid start/end date, expected YYYY-MM-DD")
+    # "NaT" and friends parse without raising
+    if pd.isna(start) or pd.isna(end):
+        raise ValueError("Invalid start/end date, expected YYYY-MM-DD")
+    if start > end:
+        raise ValueError("start must not be after end")
+    if (end - start).days + 1 > MAX_RANGE_DAYS:
+        raise ValueError(f"Date range too long, at most {MAX_RANGE_DAYS} days")
+    scoped = df[(df["Date"] >= start) & (df["Date"] <= end)]
+    return scoped, {"start": str(start.date()), "end": str(end.date())}
+
+def months_payload(df: pd.DataFrame, params: dict) -> dict:
+    periods = sorted(df["Date"].dt.to_period("M").unique())
+    return {"months": [{"month": str(p), "label": p.strftime("%B %Y")} for p in periods]}
+
+def summary_payload(df: pd.DataFrame, params: dict) -> dict:
+    scoped, scope = select_scope(df, params)
+    total_bookings = int(len(scoped))
+    return {
+        "scope": scope,
+        "total_covers": int(scoped["Pax"].sum()),
+        "total_bookings": total_bookings,
+        "avg_party": round(float(scoped["Pax"].mean()), 2) if total_bookings else 0.0,
+        "summary": top_summary(scoped) if total_bookings else {},
+    }
+
+def calendar_payload(df: pd.DataFrame, params: dict) -> dict:
+    scoped, scope = select_scope(df, params)
+    daily = daily_metrics_df(scoped, scope["start"], scope["end"])
+    return {
+        "scope": scope,
+        "days": [
+            {"date": str(r.Date.date()), "weekday": r.Date.day_name(), "bookings": int(r.Bookings), "covers": int(r.Covers)}
+            for r in daily.itertuples()
+        ],
+    }
+
+def weekly_payload(df: pd.DataFrame, params: dict) -> dict:
+    metric = params.get("metric", "Covers").capitalize()
+    if metric not in ("Covers", "Bookings"):
+        raise ValueError("metric must be Covers or Bookings")
+    scoped, scope = select_scope(df, params)
+    pivot = weekly_pivot(scoped, metric, top_n=None)
+    return {
+        "scope": scope,
+        "metric": metric,
+        "slots": [
+            {"time": time_label, **{day: int(value) for day, value in row.items()}}
+            for time_label, row in pivot.iterrows()
+        ],
+    }
+
+def sources_payload(df: pd.DataFrame, params: dict) -> dict:
+    scoped, scope = select_scope(df, params)
+    source_stats = scoped.groupby("Source").agg(Covers=("Pax", "sum"), Bookings=("Source", "size"))
+    return {
+        "scope": scope,
+        "sources": {
+            str(source): {"covers": int(row.Covers), "bookings": int(row.Bookings)}
+            for source, row in source_stats.iterrows()
+        },
+    }
+
+ROUTES = {
+    "/api/months": months_payload,
+    "/api/summary": summary_payload,
+    "/api/calendar": calendar_payload,
+    "/api/weekly": weekly_payload,
+    "/api/sources": sources_payload,
+}
+
+@lru_cache(maxsize=256)
+def render(route: str, query: tuple, fingerprint: tuple) -> tuple:
+    """(status, body, gzip body, etag) for a query against one data fingerprint.
+
+    etag is for the identity body; the gzip body's is gzip_etag(etag).
+    """
+    df = load_all_months(MONTH_FILES)
+    try:
+        payload = ROUTES[route](df, dict(query))
+        status = 200
+    except ValueError as e:
+        payload = {"error": str(e)}
+        status = 400
+
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+    gz = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+    return status, body, gz, etag
+
+def gzip_etag(etag: str) -> str:
+    # Strong validators must differ per content-coding
+    return etag[:-1] + '-gz"'
+
+def etag_matches(header: str, etag: str) -> bool:
+    """True if If-None-Match names either encoding of this body"""
+    if not header:
+        return False
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    return "*" in candidates or etag in candidates or gzip_etag(etag) in candidates
+
+def accepts_gzip(header: str) -> bool:
+    """Accept-Encoding allows gzip with q > 0 (explicitly or via *)"""
+    qualities = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding] = q
+    q = qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0)))
+    return q > 0
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SeatedAPI/1.0"
+    # Headers and body go out as separate writes; with Nagle on, keep-alive
+    # clients stall ~40ms per response waiting on delayed ACKs
+    disable_nagle_algorithm = True
+    quiet = False
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def respond(self, send_body: bool):
+        url = urlsplit(self.path)
+        route = url.path.rstrip("/") or "/"
+        if route not in ROUTES:
+            return self.send_json(404, {"error": f"Unknown endpoint {url.path}", "endpoints": sorted(ROUTES)}, send_body)
+
+        query = tuple(sorted(parse_qsl(url.query)))
+        try:
+            status, body, gz, etag = render(route, query, month_fingerprints(MONTH_FILES))
+        except ValueError as e:
+            # Raised by the pipeline itself, i.e. a malformed data file
+            return self.send_json(500, {"error": str(e)}, send_body)
+
+        use_gzip = gz is not None and accepts_gzip(self.headers.get("Accept-Encoding", ""))
+        data = gz if use_gzip else body
+        sent_etag = gzip_etag(etag) if use_gzip else etag
+
+        if status == 200 and etag_matches(self.headers.get("If-None-Match", ""), etag):
+            self.send_response(304)
+            self.send_header("ETag", sent_etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", sent_etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+
+    def send_json(self, status: int, payload: dict, send_body: bool = True):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, quiet: bool = False) -> ThreadingHTTPServer:
+    handler = type("Handler", (ApiHandler,), {"quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Seated dashboard aggregates as read-only JSON")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"bind address (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--quiet", action="store_true", help="don't log each request")
+    args = parser.parse_args(argv)
+
+    # Warm the pipeline so the first client doesn't pay for CSV parsing
+    load_all_months(MONTH_FILES)
+
+    server = make_server(args.host, args.port, args.quiet)
+    print(f"Serving on http://{args.host}:{server.server_port}/api/months")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import calendar
-from datetime import datetime
 import json
 from openai import OpenAI
 
+from anomalies import WINDOW_WEEKS, describe_anomalies
+from chat_store import ChatStore
+from pipeline import MONTH_FILES, current_anomalies, current_month_view, current_trend, load_all_months
+from trend import GRAINS, resolve_grain, trend_fig, window_series
+from warmer import CacheWarmer
+
 st.set_page_config(page_title="Seated Dashboard", layout="wide")
 
 # Initialize OpenAI client
@@ -107,250 +110,22 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-MONTH_FILES = {
-    "October 2025": "master_2025_10.csv",
-    "November 2025": "master_2025_11.csv",
-    "December 2025": "master_2025_12.csv",
-}
-
-TIME_COL_CANDIDATES = ["Time Updated", "Time", "Time_Updated"]
-
-@st.cache_data
-def load_csv(path: str) -> pd.DataFrame:
-    return pd.read_csv(path)
-
-def find_time_col(df: pd.DataFrame) -> str:
-    for c in TIME_COL_CANDIDATES:
-        if c in df.columns:
-            return c
-    return ""
-
-def clean_month_df(df: pd.DataFrame) -> pd.DataFrame:
-    needed = ["Date", "Name", "Source", "Pax"]
-    missing = [c for c in needed if c not in df.columns]
-    if missing:
-        st.error(f"Missing columns: {', '.join(missing)}")
-        st.stop()
-
-    df = df.copy()
-
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-    df["Pax"] = pd.to_numeric(df["Pax"], errors="coerce")
-    df["Name"] = df["Name"].astype(str).str.strip()
-    df["Source"] = df["Source"].astype(str).str.strip()
-
-    time_col = find_time_col(df)
-    if not time_col:
-        st.error("Missing time column. Expected one of: Time Updated, Time, Time_Updated")
-        st.stop()
-
-    t = df[time_col].astype(str).str.strip()
-
-    def normalize_time_label(x: str) -> str:
-        if not x or x.lower() in ["nan", "none"]:
-            return ""
-        x = x.replace(".", "").upper()
-        x = x.replace("  ", " ")
-        return x
-
-    df["Time_Label"] = t.map(normalize_time_label)
-
-    df = df.dropna(subset=["Date", "Pax"])
-    df = df[(df["Pax"] > 0)]
-    df = df[df["Name"].notna() & (df["Name"].str.len() > 0)]
-    df = df[df["Time_Label"].notna() & (df["Time_Label"].str.len() > 0)]
-    df = df[df["Source"].notna() & (df["Source"].str.len() > 0)]
-
-    df["DayOfWeek"] = df["Date"].dt.day_name()
-    df["DateOnly"] = df["Date"].dt.date
+@st.cache_resource
+def start_cache_warmer() -> CacheWarmer:
+    """One warmer thread per server process, started with the app"""
+    warmer = CacheWarmer(MONTH_FILES)
+    warmer.start()
+    return warmer
 
-    return df
+cache_warmer = start_cache_warmer()
 
-def month_calendar_df(df: pd.DataFrame, year: int, month: int) -> pd.DataFrame:
-    daily_metrics = (
-        df.groupby("DateOnly")
-        .agg(Bookings=("DateOnly", "size"), Covers=("Pax", "sum"))
-        .reset_index()
-    )
-
-    first_day = pd.Timestamp(year, month, 1)
-    last_day = pd.Timestamp(year, month, calendar.monthrange(year, month)[1])
-    all_days = pd.date_range(first_day, last_day, freq="D")
-
-    cal_df = pd.DataFrame({"Date": all_days})
-    cal_df["DateOnly"] = cal_df["Date"].dt.date
-    cal_df = cal_df.merge(daily_metrics, on="DateOnly", how="left").fillna(0)
-
-    cal_df["Weekday"] = cal_df["Date"].dt.weekday
-    cal_df["DayIndex"] = (cal_df["Date"] - first_day).dt.days
-    cal_df["WeekRow"] = ((cal_df["DayIndex"] + first_day.weekday()) // 7).astype(int)
-
-    return cal_df
-
-def calendar_heatmap(cal_df: pd.DataFrame, value_col: str, colorscale) -> go.Figure:
-    weekday_labels = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-
-    pivot = cal_df.pivot(index="WeekRow", columns="Weekday", values=value_col)
-    date_pivot = cal_df.pivot(index="WeekRow", columns="Weekday", values="DateOnly")
-
-    text = date_pivot.copy()
-    hover = date_pivot.copy()
-
-    for r in text.index:
-        for c in text.columns:
-            d = text.loc[r, c]
-            if pd.isna(d):
-                text.loc[r, c] = ""
-                hover.loc[r, c] = ""
-            else:
-                day_num = pd.Timestamp(d).day
-                bookings = int(cal_df.loc[cal_df["DateOnly"] == d, "Bookings"].iloc[0])
-                covers = int(cal_df.loc[cal_df["DateOnly"] == d, "Covers"].iloc[0])
-                val = int(pivot.loc[r, c]) if not pd.isna(pivot.loc[r, c]) else 0
-
-                text.loc[r, c] = f"{day_num}<br><b>{val}</b>"
-                hover.loc[r, c] = f"{d}<br>Bookings: {bookings}<br>Covers: {covers}"
-
-    fig = go.Figure(
-        go.Heatmap(
-            z=pivot.values,
-            x=weekday_labels,
-            y=[f"W{i+1}" for i in pivot.index],
-            text=text.values,
-            texttemplate="%{text}",
-            hovertext=hover.values,
-            hoverinfo="text",
-            showscale=False,
-            colorscale=colorscale,
-        )
-    )
+# Streamlit doesn't report the browser viewport, so the trend chart's point
+# budget is sized to the widest it can render: the 1600px .block-container
+# max-width set in the CSS above
+TREND_CHART_WIDTH_PX = 1600
 
-    fig.update_layout(
-        height=360,
-        margin=dict(l=10, r=10, t=10, b=10),
-        yaxis=dict(autorange="reversed"),
-        paper_bgcolor="white",
-        plot_bgcolor="white",
-        font=dict(color="#6b7280", size=11, family="Inter"),
-        xaxis=dict(side="top"),
-    )
-    return fig
-
-def weekly_view_fig(df: pd.DataFrame, metric: str) -> go.Figure:
-    dow_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    dow_labels = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-
-    if metric == "Covers":
-        agg = df.groupby(["DayOfWeek", "Time_Label"])["Pax"].sum().reset_index()
-        agg.rename(columns={"Pax": "Value"}, inplace=True)
-    else:
-        agg = df.groupby(["DayOfWeek", "Time_Label"]).size().reset_index(name="Value")
-
-    pivot = agg.pivot(index="Time_Label", columns="DayOfWeek", values="Value").reindex(columns=dow_order).fillna(0)
-
-    # Focus on top 10 time slots for better readability
-    top_times = agg.groupby("Time_Label")["Value"].sum().sort_values(ascending=False).head(10).index
-    pivot = pivot.loc[pivot.index.isin(top_times)]
-
-    # Sort time labels
-    def time_sort_key(t: str):
-        try:
-            return datetime.strptime(t.replace(" ", ""), "%I:%M%p")
-        except Exception:
-            try:
-                return datetime.strptime(t.replace(" ", ""), "%I%p")
-            except Exception:
-                return datetime.min
-
-    pivot = pivot.reindex(sorted(pivot.index, key=time_sort_key))
-
-    # Clean text values - only show if > 50 to reduce clutter
-    z_values = pivot.values
-    text_values = [[f'{int(val)}' if val > 50 else '' for val in row] for row in z_values]
-
-    fig = go.Figure(
-        data=go.Heatmap(
-            z=z_values,
-            x=dow_labels,
-            y=pivot.index.tolist(),
-            colorscale=[[0, "#eff6ff"], [0.5, "#60a5fa"], [1, "#1e40af"]] if metric == "Covers"
-                      else [[0, "#f0fdf4"], [0.5, "#34d399"], [1, "#166534"]],
-            showscale=False,
-            text=text_values,
-            texttemplate='%{text}',
-            textfont=dict(size=11, family='Inter', color='#1a1d29', weight=600),
-            hovertemplate="%{y}<br>%{x}<br>" + metric + ": %{z}<extra></extra>",
-        )
-    )
-
-    fig.update_layout(
-        height=380,
-        margin=dict(l=80, r=10, t=10, b=40),
-        paper_bgcolor="white",
-        plot_bgcolor="white",
-        font=dict(color="#6b7280", size=11, family="Inter"),
-        yaxis=dict(autorange="reversed", fixedrange=True),
-        xaxis=dict(fixedrange=True)
-    )
-    return fig
-
-def top_summary(df: pd.DataFrame):
-    dow_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-
-    # Busiest day by covers
-    day_covers = df.groupby("DayOfWeek")["Pax"].sum().reindex(dow_order)
-    busiest_day_covers = day_covers.idxmax()
-    busiest_day_covers_count = int(day_covers.max())
-    
-    # Busiest day by bookings
-    day_bookings = df.groupby("DayOfWeek").size().reindex(dow_order)
-    busiest_day_bookings = day_bookings.idxmax()
-    busiest_day_bookings_count = int(day_bookings.max())
-
-    # Busiest time by covers
-    time_covers = df.groupby("Time_Label")["Pax"].sum().sort_values(ascending=False)
-    busiest_time_covers = time_covers.index[0] if len(time_covers) else ""
-    busiest_time_covers_count = int(time_covers.iloc[0]) if len(time_covers) else 0
-    
-    # Busiest time by bookings
-    time_bookings = df.groupby("Time_Label").size().sort_values(ascending=False)
-    busiest_time_bookings = time_bookings.index[0] if len(time_bookings) else ""
-    busiest_time_bookings_count = int(time_bookings.iloc[0]) if len(time_bookings) else 0
-
-    # Busiest day+time by covers
-    day_time_covers = df.groupby(["DayOfWeek", "Time_Label"])["Pax"].sum().sort_values(ascending=False)
-    if len(day_time_covers) > 0:
-        peak_dow, peak_time = day_time_covers.index[0]
-        peak_covers_count = int(day_time_covers.iloc[0])
-        busiest_day_time_covers = f"{peak_dow} @ {peak_time}"
-    else:
-        busiest_day_time_covers = ""
-        peak_covers_count = 0
-    
-    # Busiest day+time by bookings
-    day_time_bookings = df.groupby(["DayOfWeek", "Time_Label"]).size().sort_values(ascending=False)
-    if len(day_time_bookings) > 0:
-        peak_dow_b, peak_time_b = day_time_bookings.index[0]
-        peak_bookings_count = int(day_time_bookings.iloc[0])
-        busiest_day_time_bookings = f"{peak_dow_b} @ {peak_time_b}"
-    else:
-        busiest_day_time_bookings = ""
-        peak_bookings_count = 0
-
-    return {
-        "busiest_day_covers": busiest_day_covers,
-        "busiest_day_covers_count": busiest_day_covers_count,
-        "busiest_day_bookings": busiest_day_bookings,
-        "busiest_day_bookings_count": busiest_day_bookings_count,
-        "busiest_time_covers": busiest_time_covers,
-        "busiest_time_covers_count": busiest_time_covers_count,
-        "busiest_time_bookings": busiest_time_bookings,
-        "busiest_time_bookings_count": busiest_time_bookings_count,
-        "busiest_day_time_covers": busiest_day_time_covers,
-        "busiest_day_time_covers_count": peak_covers_count,
-        "busiest_day_time_bookings": busiest_day_time_bookings,
-        "busiest_day_time_bookings_count": peak_bookings_count,
-    }
+# Chat messages rendered per "page" of history
+CHAT_PAGE_SIZE = 20
 
 # Chat analytics functions using OpenAI
 def get_data_summary(df: pd.DataFrame) -> dict:
@@ -375,8 +150,14 @@ def get_data_summary(df: pd.DataFrame) -> dict:
     }
     return summary
 
-def run_analytics_with_ai(df: pd.DataFrame, question: str) -> str:
-    """Use OpenAI to answer questions about the data"""
+def run_analytics_with_ai(df: pd.DataFrame, question: str, anomalies: pd.DataFrame = None,
+                          history: list = None, period: pd.Period = None) -> str:
+    """Use OpenAI to answer questions about the data; history is ChatStore.context_messages().
+
+    period is the month being analyzed (None for all months) and scopes the unusual days.
+
+    API errors propagate so the caller can keep them out of the chat history.
+    """
     
     # Get data summary for context
     summary = get_data_summary(df)
@@ -417,6 +198,15 @@ def run_analytics_with_ai(df: pd.DataFrame, question: str) -> str:
     # Format daily data as readable strings (e.g., "2025-12-05: 324 covers")
     daily_covers_str = "\n".join([f"  {str(date)}: {int(covers)} covers" for date, covers in sorted(daily_covers.items())])
     daily_bookings_str = "\n".join([f"  {str(date)}: {int(bookings)} bookings" for date, bookings in sorted(daily_bookings.items())])
+
+    # Unusual days within the analyzed month's calendar, including days with no bookings at all
+    if anomalies is not None:
+        in_scope = anomalies
+        if period is not None:
+            in_scope = anomalies[(anomalies["Date"] >= period.start_time) & (anomalies["Date"] <= period.end_time)]
+        anomalies_str = "\n".join(f"  {line}" for line in describe_anomalies(in_scope)) or "  None"
+    else:
+        anomalies_str = "  None"
     
     # Create context for OpenAI
     context = f"""
@@ -454,6 +244,9 @@ Daily Breakdown (all dates):
 Daily Bookings (all dates):
 {daily_bookings_str}
 
+Unusual Days (robust z-score vs the same weekday over the previous {WINDOW_WEEKS} weeks; 0 usually means missing data or a closure):
+{anomalies_str}
+
 Instructions:
 - Answer clearly and concisely
 - Use specific numbers from the data
@@ -461,56 +254,48 @@ Instructions:
 - Use markdown formatting for emphasis
 - When asked about a specific date (e.g., "December 5th" or "the 5th"), look it up in the Daily Breakdown section above
 - The dates are in YYYY-MM-DD format (e.g., 2025-12-05 is December 5th, 2025)
+- When asked about unusual, abnormal or outlier days, use the Unusual Days section above
 - If the data doesn't contain the answer, say so
 """
     
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": context},
-                {"role": "user", "content": question}
-            ],
-            temperature=0.3,
-            max_tokens=500
-        )
-        
-        return response.choices[0].message.content
-    
-    except Exception as e:
-        return f"Sorry, I encountered an error: {str(e)}\n\nPlease try rephrasing your question."
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": context},
+            *(history or []),
+            {"role": "user", "content": question}
+        ],
+        temperature=0.3,
+        max_tokens=500
+    )
 
-@st.cache_data
-def load_all_months(month_files: dict) -> pd.DataFrame:
-    """Load and combine all monthly CSV files"""
-    frames = []
-    for file_path in month_files.values():
-        frames.append(clean_month_df(load_csv(file_path)))
-    return pd.concat(frames, ignore_index=True)
+    return response.choices[0].message.content
 
 # Main dashboard
 st.markdown('<div class="main-title">Seated Performance Dashboard</div>', unsafe_allow_html=True)
 st.markdown('<div class="sub-title">Monthly views for covers, bookings, calendar demand, and busiest patterns</div>', unsafe_allow_html=True)
+st.caption(cache_warmer.status_line())
 
 st.markdown("<br>", unsafe_allow_html=True)
 
-# Add Chat to the tabs
-month_tabs = st.tabs(list(MONTH_FILES.keys()) + ["Chat"])
+# Add Trends and Chat to the tabs
+month_tabs = st.tabs(list(MONTH_FILES.keys()) + ["Trends", "Chat"])
 
-for tab_name, tab in zip(MONTH_FILES.keys(), month_tabs[:-1]):
+for tab_name, tab in zip(MONTH_FILES.keys(), month_tabs[:-2]):
     with tab:
-        file_path = MONTH_FILES[tab_name]
-        raw = load_csv(file_path)
-        df = clean_month_df(raw)
+        try:
+            view = current_month_view(MONTH_FILES[tab_name])
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
 
-        year = int(df["Date"].dt.year.dropna().unique()[-1])
-        month = int(df["Date"].dt.month.dropna().unique()[-1])
+        figures = view["figures"]
 
-        total_covers = int(df["Pax"].sum())
-        total_bookings = int(len(df))
-        avg_party = float(df["Pax"].mean()) if total_bookings else 0.0
+        total_covers = view["total_covers"]
+        total_bookings = view["total_bookings"]
+        avg_party = view["avg_party"]
 
-        summary = top_summary(df)
+        summary = view["summary"]
 
         st.markdown("<br>", unsafe_allow_html=True)
 
@@ -558,24 +343,14 @@ for tab_name, tab in zip(MONTH_FILES.keys(), month_tabs[:-1]):
 
         st.markdown("<br>", unsafe_allow_html=True)
 
-        cal_df = month_calendar_df(df, year, month)
-
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown('<div class="card-title">Calendar View</div>', unsafe_allow_html=True)
 
         t1, t2 = st.tabs(["Covers", "Bookings"])
         with t1:
-            st.plotly_chart(
-                calendar_heatmap(cal_df, "Covers", [[0, "#eff6ff"], [0.5, "#3b82f6"], [1, "#1e3a8a"]]),
-                use_container_width=True,
-                config={'displayModeBar': False}
-            )
+            st.plotly_chart(figures["calendar_covers"], use_container_width=True, config={'displayModeBar': False})
         with t2:
-            st.plotly_chart(
-                calendar_heatmap(cal_df, "Bookings", [[0, "#f0fdf4"], [0.5, "#22c55e"], [1, "#166534"]]),
-                use_container_width=True,
-                config={'displayModeBar': False}
-            )
+            st.plotly_chart(figures["calendar_bookings"], use_container_width=True, config={'displayModeBar': False})
 
         st.markdown("</div>", unsafe_allow_html=True)
         st.markdown("<br>", unsafe_allow_html=True)
@@ -583,134 +358,21 @@ for tab_name, tab in zip(MONTH_FILES.keys(), month_tabs[:-1]):
         # Just show Walk-ins vs Reservations chart (removing Busiest Day of Week)
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown('<div class="card-title">Walk-ins vs Reservations</div>', unsafe_allow_html=True)
-
-        # Get total covers by source, removing any invalid values
-        source_totals = df[df["Source"].notna() & (df["Source"].str.strip().str.len() > 0)].groupby("Source")["Pax"].sum().reset_index()
-        source_totals.columns = ["Source", "Covers"]
-        
-        # Filter out 'nan' strings
-        source_totals = source_totals[source_totals["Source"].str.lower() != 'nan']
-
-        fig_mix = go.Figure(data=[
-            go.Bar(
-                x=source_totals["Source"],
-                y=source_totals["Covers"],
-                marker_color='#3b82f6',
-                marker_line_width=0,
-                text=source_totals["Covers"].astype(int),
-                textposition="outside",
-                textfont=dict(size=11, color='#6b7280', family='Inter')
-            )
-        ])
-        
-        fig_mix.update_layout(
-            height=320,
-            margin=dict(l=10, r=10, t=10, b=40),
-            paper_bgcolor="white",
-            plot_bgcolor="white",
-            font=dict(color="#6b7280", size=11, family="Inter"),
-            showlegend=False,
-            xaxis=dict(showgrid=False, showline=False),
-            yaxis=dict(showgrid=True, gridcolor="#f3f4f6", showline=False, zeroline=False, title="Total Covers"),
-        )
-        st.plotly_chart(fig_mix, use_container_width=True, config={'displayModeBar': False})
+        st.plotly_chart(figures["source_mix"], use_container_width=True, config={'displayModeBar': False})
         st.markdown('</div>', unsafe_allow_html=True)
 
         st.markdown("<br>", unsafe_allow_html=True)
 
         # Source Analysis Section
-        dow_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown('<div class="card-title">Source Analysis - Walk-ins vs Reservations</div>', unsafe_allow_html=True)
-        
+
         source_col1, source_col2 = st.columns(2)
-        
-        # Clean dataframe to remove nan sources
-        df_clean = df[df["Source"].notna() & (df["Source"].str.strip().str.len() > 0)].copy()
-        df_clean = df_clean[df_clean["Source"].str.lower() != 'nan']
-        
-        # Walk-ins vs Reservations by Day of Week
         with source_col1:
-            source_dow = df_clean.groupby(["DayOfWeek", "Source"])["Pax"].sum().reset_index()
-            source_dow_pivot = source_dow.pivot(index="DayOfWeek", columns="Source", values="Pax").reindex(dow_order).fillna(0)
-            
-            fig_source_dow = go.Figure()
-            
-            for source in source_dow_pivot.columns:
-                fig_source_dow.add_trace(go.Bar(
-                    x=source_dow_pivot.index,
-                    y=source_dow_pivot[source],
-                    name=source,
-                    marker_color='#3b82f6' if source == 'Reservation' else '#f59e0b',
-                    text=source_dow_pivot[source].astype(int),
-                    textposition="inside",
-                    textfont=dict(size=10, color='white', family='Inter')
-                ))
-            
-            fig_source_dow.update_layout(
-                title=dict(text="Covers by Day of Week", font=dict(size=13, color='#6b7280')),
-                barmode="stack",
-                height=300,
-                margin=dict(l=10, r=10, t=40, b=40),
-                paper_bgcolor="white",
-                plot_bgcolor="white",
-                font=dict(color="#6b7280", size=10, family="Inter"),
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-                xaxis=dict(showgrid=False, showline=False),
-                yaxis=dict(showgrid=True, gridcolor="#f3f4f6", showline=False, zeroline=False),
-            )
-            
-            st.plotly_chart(fig_source_dow, use_container_width=True, config={'displayModeBar': False})
-        
-        # Walk-ins vs Reservations by Time
+            st.plotly_chart(figures["source_dow"], use_container_width=True, config={'displayModeBar': False})
         with source_col2:
-            source_time = df_clean.groupby(["Time_Label", "Source"])["Pax"].sum().reset_index()
-            top_times_source = source_time.groupby("Time_Label")["Pax"].sum().sort_values(ascending=False).head(10).index
-            source_time_filtered = source_time[source_time["Time_Label"].isin(top_times_source)]
-            
-            source_time_pivot = source_time_filtered.pivot(index="Time_Label", columns="Source", values="Pax").fillna(0)
-            
-            # Sort by time
-            def time_sort_key(t: str):
-                try:
-                    return datetime.strptime(t.replace(" ", ""), "%I:%M%p")
-                except Exception:
-                    try:
-                        return datetime.strptime(t.replace(" ", ""), "%I%p")
-                    except Exception:
-                        return datetime.min
-            
-            source_time_pivot = source_time_pivot.reindex(sorted(source_time_pivot.index, key=time_sort_key))
-            
-            fig_source_time = go.Figure()
-            
-            for source in source_time_pivot.columns:
-                fig_source_time.add_trace(go.Bar(
-                    x=source_time_pivot.index,
-                    y=source_time_pivot[source],
-                    name=source,
-                    marker_color='#3b82f6' if source == 'Reservation' else '#f59e0b',
-                    text=source_time_pivot[source].astype(int),
-                    textposition="inside",
-                    textfont=dict(size=10, color='white', family='Inter')
-                ))
-            
-            fig_source_time.update_layout(
-                title=dict(text="Covers by Time Slot (Top 10)", font=dict(size=13, color='#6b7280')),
-                barmode="stack",
-                height=300,
-                margin=dict(l=10, r=10, t=40, b=40),
-                paper_bgcolor="white",
-                plot_bgcolor="white",
-                font=dict(color="#6b7280", size=10, family="Inter"),
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-                xaxis=dict(showgrid=False, showline=False, tickangle=-45),
-                yaxis=dict(showgrid=True, gridcolor="#f3f4f6", showline=False, zeroline=False),
-            )
-            
-            st.plotly_chart(fig_source_time, use_container_width=True, config={'displayModeBar': False})
-        
+            st.plotly_chart(figures["source_time"], use_container_width=True, config={'displayModeBar': False})
+
         st.markdown('</div>', unsafe_allow_html=True)
 
         st.markdown("<br>", unsafe_allow_html=True)
@@ -720,12 +382,54 @@ for tab_name, tab in zip(MONTH_FILES.keys(), month_tabs[:-1]):
 
         w1, w2 = st.tabs(["Covers", "Bookings"])
         with w1:
-            st.plotly_chart(weekly_view_fig(df, "Covers"), use_container_width=True, config={'displayModeBar': False})
+            st.plotly_chart(figures["weekly_covers"], use_container_width=True, config={'displayModeBar': False})
         with w2:
-            st.plotly_chart(weekly_view_fig(df, "Bookings"), use_container_width=True, config={'displayModeBar': False})
+            st.plotly_chart(figures["weekly_bookings"], use_container_width=True, config={'displayModeBar': False})
 
         st.markdown("</div>", unsafe_allow_html=True)
 
+# Trends Tab
+with month_tabs[-2]:
+    st.markdown('<div class="main-title">Trends</div>', unsafe_allow_html=True)
+    st.markdown('<div class="sub-title">Daily and per-slot covers and bookings across the full history</div>', unsafe_allow_html=True)
+
+    try:
+        daily_trend = current_trend("Daily", MONTH_FILES)
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+
+    first_day = daily_trend["Time"].min().date()
+    last_day = daily_trend["Time"].max().date()
+
+    tc1, tc2 = st.columns([1, 1])
+    with tc1:
+        trend_metrics = st.multiselect("Metrics", ["Covers", "Bookings"], default=["Covers"], key="trend_metrics")
+    with tc2:
+        trend_grain = st.radio("Granularity", GRAINS, horizontal=True, key="trend_grain")
+
+    # Narrowing the range re-queries the window, so zooming in brings back finer detail
+    trend_start, trend_end = st.slider(
+        "Date range",
+        min_value=first_day,
+        max_value=last_day,
+        value=(first_day, last_day),
+        format="MMM D, YYYY",
+        key="trend_range",
+    )
+
+    grain = resolve_grain(trend_grain, trend_start, trend_end)
+    series = window_series(current_trend(grain, MONTH_FILES), trend_start, trend_end)
+
+    if not trend_metrics:
+        st.info("Select at least one metric.")
+    else:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        fig_trend, sent, total = trend_fig(series, trend_metrics, grain, TREND_CHART_WIDTH_PX)
+        st.plotly_chart(fig_trend, use_container_width=True, config={'displayModeBar': False})
+        st.markdown('</div>', unsafe_allow_html=True)
+        st.caption(f"{grain} points: showing {sent:,} of {total:,}")
+
 # Chat Tab
 with month_tabs[-1]:
     st.markdown('<div class="main-title">Chat with Your Data</div>', unsafe_allow_html=True)
@@ -734,7 +438,11 @@ with month_tabs[-1]:
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Load all months data
-    df_all = load_all_months(MONTH_FILES)
+    try:
+        df_all = load_all_months(MONTH_FILES)
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
     
     # Month selector
     months = sorted(df_all["Date"].dt.strftime("%B %Y").unique().tolist())
@@ -742,9 +450,11 @@ with month_tabs[-1]:
     
     if month_scope != "All months":
         working_df = df_all[df_all["Date"].dt.strftime("%B %Y") == month_scope].copy()
+        scope_period = pd.Period(month_scope, freq="M")
         st.caption(f"Analyzing data from: {month_scope}")
     else:
         working_df = df_all.copy()
+        scope_period = None
         st.caption(f"Analyzing data from: All {len(months)} months")
     
     st.markdown("<br>", unsafe_allow_html=True)
@@ -755,29 +465,41 @@ with month_tabs[-1]:
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    # Initialize chat history
+    if "chat_store" not in st.session_state:
+        st.session_state.chat_store = ChatStore()
+    if "chat_pages" not in st.session_state:
+        st.session_state.chat_pages = 1
+    chat_store = st.session_state.chat_store
+
     # Clear chat button
     col1, col2 = st.columns([6, 1])
     with col2:
         if st.button("Clear Chat", type="secondary"):
-            st.session_state.messages = []
+            chat_store.clear()
+            st.session_state.chat_pages = 1
             st.rerun()
     
     st.markdown("<br>", unsafe_allow_html=True)
     
-    # Initialize chat history
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
-    
-    # Display chat history
-    for message in st.session_state.messages:
+    # Display only the most recent page(s) of chat history
+    shown = min(len(chat_store), st.session_state.chat_pages * CHAT_PAGE_SIZE)
+    if shown < len(chat_store):
+        if st.button(f"Show earlier messages ({len(chat_store) - shown} more)", type="secondary"):
+            st.session_state.chat_pages += 1
+            st.rerun()
+    elif chat_store.total_messages > len(chat_store):
+        st.caption(f"{chat_store.total_messages - len(chat_store)} older messages are no longer shown")
+
+    for message in chat_store.tail(shown):
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
     
     # Chat input
     if prompt := st.chat_input("Ask a question about your reservation data..."):
-        # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        
+        # Earlier turns the model should see, taken before this question is added
+        history = chat_store.context_messages()
+
         # Display user message
         with st.chat_message("user"):
             st.markdown(prompt)
@@ -785,8 +507,16 @@ with month_tabs[-1]:
         # Generate response using OpenAI
         with st.chat_message("assistant"):
             with st.spinner("Analyzing data with AI..."):
-                response = run_analytics_with_ai(working_df, prompt)
-                st.markdown(response)
+                try:
+                    response = run_analytics_with_ai(working_df, prompt, current_anomalies(MONTH_FILES), history, scope_period)
+                except Exception as e:
+                    response = None
+                    st.markdown(f"Sorry, I encountered an error: {str(e)}\n\nPlease try rephrasing your question.")
+                else:
+                    st.markdown(response)
         
-        # Add assistant response to chat history
-        st.session_state.messages.append({"role": "assistant", "content": response})
+        # Store the exchange only once it succeeded; a failed question and its error
+        # are shown once but never sent back to the model or folded into the summary
+        if response is not None:
+            chat_store.append("user", prompt)
+            chat_store.append("assistant", response)
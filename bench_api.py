@@ -0,0 +1,97 @@
+"""Request throughput benchmark for api.py.
+
+Starts the API on an ephemeral port and measures requests/second for a
+polling client in three modes: full 200 responses, gzip 200 responses and
+conditional requests answered with 304.
+
+    python bench_api.py --requests 2000 --clients 8
+"""
+import argparse
+import http.client
+import statistics
+import threading
+import time
+
+from api import make_server
+from pipeline import MONTH_FILES, load_all_months
+
+ENDPOINTS = [
+    "/api/summary?month=2025-10",
+    "/api/calendar?start=2025-10-01&end=2025-12-31",
+    "/api/weekly?metric=Covers",
+    "/api/sources",
+]
+
+
+def run_client(port: int, n: int, headers: dict, conditional: bool, latencies: list, statuses: dict, lock):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    etags = {}
+    local = []
+    for i in range(n):
+        path = ENDPOINTS[i % len(ENDPOINTS)]
+        req_headers = dict(headers)
+        if conditional and path in etags:
+            req_headers["If-None-Match"] = etags[path]
+        started = time.perf_counter()
+        conn.request("GET", path, headers=req_headers)
+        resp = conn.getresponse()
+        resp.read()
+        local.append(time.perf_counter() - started)
+        etags[path] = resp.getheader("ETag")
+        with lock:
+            statuses[resp.status] = statuses.get(resp.status, 0) + 1
+    conn.close()
+    with lock:
+        latencies.extend(local)
+
+def bench(port: int, total: int, clients: int, headers: dict, conditional: bool) -> dict:
+    latencies, statuses, lock = [], {}, threading.Lock()
+    per_client = max(1, total // clients)
+    threads = [
+        threading.Thread(target=run_client, args=(port, per_client, headers, conditional, latencies, statuses, lock))
+        for _ in range(clients)
+    ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "statuses": statuses,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark api.py request throughput")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per mode (default: 2000)")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent keep-alive clients (default: 8)")
+    args = parser.parse_args(argv)
+
+    load_all_months(MONTH_FILES)
+    server = make_server(port=0, quiet=True)
+    port = server.server_port
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Prime the response cache so every mode measures the steady state a poller sees
+    bench(port, len(ENDPOINTS), 1, {}, False)
+
+    modes = [
+        ("200 identity", {}, False),
+        ("200 gzip", {"Accept-Encoding": "gzip"}, False),
+        ("304 If-None-Match", {"Accept-Encoding": "gzip"}, True),
+    ]
+    print(f"{'mode':<20}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}  statuses")
+    for name, headers, conditional in modes:
+        r = bench(port, args.requests, args.clients, headers, conditional)
+        print(f"{name:<20}{r['requests']:>10}{r['rps']:>10.0f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}  {r['statuses']}")
+
+    server.shutdown()
+    server.server_close()
+
+if __name__ == "__main__":
+    main()
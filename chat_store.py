@@ -0,0 +1,114 @@
+import re
+
+# Recent turns sent verbatim to the model
+WINDOW_TOKENS = 1500
+# Rolling summary of everything older than the window
+SUMMARY_TOKENS = 300
+# The session's opening questions always stay in the summary, so its topic survives
+SUMMARY_HEAD_QUESTIONS = 3
+# Transcript kept for display; anything older only lives on in the summary
+MAX_MESSAGES = 200
+
+SNIPPET_CHARS = 120
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English); avoids a tokenizer dependency"""
+    return len(text) // 4 + 1
+
+def snippet(text: str, limit: int = SNIPPET_CHARS) -> str:
+    text = re.sub(r"[*_`#>]+", "", text)
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+class ChatStore:
+    """Chat transcript with a token-budgeted model window and a rolling summary.
+
+    Messages enter the window as they arrive. When the window exceeds
+    window_tokens the oldest messages leave it and their user questions are
+    folded into a condensed summary: the session's first few questions are
+    always kept, followed by the most recent folded ones, with a count
+    standing in for those squeezed out between to stay within summary_tokens.
+    Answers are not summarized; the model can re-derive them from the data.
+    Only max_messages are kept for display.
+    """
+
+    def __init__(self, window_tokens: int = WINDOW_TOKENS, summary_tokens: int = SUMMARY_TOKENS,
+                 max_messages: int = MAX_MESSAGES):
+        self.window_tokens = window_tokens
+        self.summary_tokens = summary_tokens
+        self.max_messages = max_messages
+        self.clear()
+
+    def clear(self):
+        self.messages = []
+        self.total_messages = 0
+        self._window_start = 0
+        self._window_used = 0
+        self._summary_head = []
+        self._summary_tail = []
+        self._summary_used = 0
+        self._summary_omitted = 0
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def append(self, role: str, content: str):
+        tokens = estimate_tokens(content)
+        self.messages.append({"role": role, "content": content, "tokens": tokens})
+        self.total_messages += 1
+        self._window_used += tokens
+        self._compact()
+
+    def _compact(self):
+        # Keep at least the newest message in the window, however long it is
+        while self._window_used > self.window_tokens and self._window_start < len(self.messages) - 1:
+            self._fold(self.messages[self._window_start])
+            self._window_used -= self.messages[self._window_start]["tokens"]
+            self._window_start += 1
+
+        overflow = len(self.messages) - self.max_messages
+        if overflow > 0:
+            # Messages still in the window are never dropped here
+            overflow = min(overflow, self._window_start)
+            del self.messages[:overflow]
+            self._window_start -= overflow
+
+    def _fold(self, message: dict):
+        if message["role"] != "user":
+            return
+        line = f"- {snippet(message['content'])}"
+        self._summary_used += estimate_tokens(line)
+        if len(self._summary_head) < SUMMARY_HEAD_QUESTIONS:
+            self._summary_head.append(line)
+            return
+
+        self._summary_tail.append(line)
+        while self._summary_used > self.summary_tokens and len(self._summary_tail) > 1:
+            self._summary_used -= estimate_tokens(self._summary_tail.pop(0))
+            self._summary_omitted += 1
+
+    @property
+    def summary(self) -> str:
+        lines = list(self._summary_head)
+        if self._summary_omitted:
+            lines.append(f"- ({self._summary_omitted} further questions omitted)")
+        lines.extend(self._summary_tail)
+        return "\n".join(lines)
+
+    def context_messages(self) -> list:
+        """Messages to send the model: the rolling summary (if any) followed by the recent window"""
+        context = []
+        if self._summary_head:
+            context.append({
+                "role": "system",
+                "content": "Earlier questions in this conversation (oldest first):\n" + self.summary,
+            })
+        context.extend(
+            {"role": m["role"], "content": m["content"]} for m in self.messages[self._window_start:]
+        )
+        return context
+
+    def tail(self, n: int) -> list:
+        return self.messages[-n:] if n > 0 else []
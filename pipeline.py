@@ -0,0 +1,539 @@
+import os
+import calendar
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import wraps
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from anomalies import AnomalyDetector
+from trend import trend_series
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MONTH_FILES = {
+    "October 2025": "master_2025_10.csv",
+    "November 2025": "master_2025_11.csv",
+    "December 2025": "master_2025_12.csv",
+}
+
+TIME_COL_CANDIDATES = ["Time Updated", "Time", "Time_Updated"]
+
+DOW_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+COVERS_CALENDAR_COLORS = [[0, "#eff6ff"], [0.5, "#3b82f6"], [1, "#1e3a8a"]]
+BOOKINGS_CALENDAR_COLORS = [[0, "#f0fdf4"], [0.5, "#22c55e"], [1, "#166534"]]
+
+
+def data_path(file_name: str) -> str:
+    return os.path.join(DATA_DIR, file_name)
+
+def file_fingerprint(path: str) -> tuple:
+    """(mtime_ns, size) of a data file, used as the cache key for everything derived from it"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (0, 0)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def month_fingerprints(month_files: dict = MONTH_FILES) -> tuple:
+    """((file_name, fingerprint), ...) for every month; the cache key for cross-month results"""
+    return tuple((f, file_fingerprint(data_path(f))) for f in month_files.values())
+
+def load_csv(path: str) -> pd.DataFrame:
+    return pd.read_csv(path)
+
+def find_time_col(df: pd.DataFrame) -> str:
+    for c in TIME_COL_CANDIDATES:
+        if c in df.columns:
+            return c
+    return ""
+
+def clean_month_df(df: pd.DataFrame) -> pd.DataFrame:
+    needed = ["Date", "Name", "Source", "Pax"]
+    missing = [c for c in needed if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    df = df.copy()
+
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    df["Pax"] = pd.to_numeric(df["Pax"], errors="coerce")
+    df["Name"] = df["Name"].astype(str).str.strip()
+    df["Source"] = df["Source"].astype(str).str.strip()
+
+    time_col = find_time_col(df)
+    if not time_col:
+        raise ValueError("Missing time column. Expected one of: Time Updated, Time, Time_Updated")
+
+    t = df[time_col].astype(str).str.strip()
+
+    def normalize_time_label(x: str) -> str:
+        if not x or x.lower() in ["nan", "none"]:
+            return ""
+        x = x.replace(".", "").upper()
+        x = x.replace("  ", " ")
+        return x
+
+    df["Time_Label"] = t.map(normalize_time_label)
+
+    df = df.dropna(subset=["Date", "Pax"])
+    df = df[(df["Pax"] > 0)]
+    df = df[df["Name"].notna() & (df["Name"].str.len() > 0)]
+    df = df[df["Time_Label"].notna() & (df["Time_Label"].str.len() > 0)]
+    df = df[df["Source"].notna() & (df["Source"].str.len() > 0)]
+
+    df["DayOfWeek"] = df["Date"].dt.day_name()
+    df["DateOnly"] = df["Date"].dt.date
+
+    return df
+
+def time_sort_key(t: str):
+    try:
+        return datetime.strptime(t.replace(" ", ""), "%I:%M%p")
+    except Exception:
+        try:
+            return datetime.strptime(t.replace(" ", ""), "%I%p")
+        except Exception:
+            return datetime.min
+
+def month_calendar_df(df: pd.DataFrame, year: int, month: int) -> pd.DataFrame:
+    daily_metrics = (
+        df.groupby("DateOnly")
+        .agg(Bookings=("DateOnly", "size"), Covers=("Pax", "sum"))
+        .reset_index()
+    )
+
+    first_day = pd.Timestamp(year, month, 1)
+    last_day = pd.Timestamp(year, month, calendar.monthrange(year, month)[1])
+    all_days = pd.date_range(first_day, last_day, freq="D")
+
+    cal_df = pd.DataFrame({"Date": all_days})
+    cal_df["DateOnly"] = cal_df["Date"].dt.date
+    cal_df = cal_df.merge(daily_metrics, on="DateOnly", how="left").fillna(0)
+
+    cal_df["Weekday"] = cal_df["Date"].dt.weekday
+    cal_df["DayIndex"] = (cal_df["Date"] - first_day).dt.days
+    cal_df["WeekRow"] = ((cal_df["DayIndex"] + first_day.weekday()) // 7).astype(int)
+
+    return cal_df
+
+def calendar_heatmap(cal_df: pd.DataFrame, value_col: str, colorscale, anomalies: pd.DataFrame = None) -> go.Figure:
+    weekday_labels = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+    pivot = cal_df.pivot(index="WeekRow", columns="Weekday", values=value_col)
+    date_pivot = cal_df.pivot(index="WeekRow", columns="Weekday", values="DateOnly")
+
+    text = date_pivot.copy()
+    hover = date_pivot.copy()
+
+    # Days flagged for this metric -> (typical value, z-score)
+    flagged = {}
+    if anomalies is not None and len(anomalies):
+        hits = anomalies[anomalies[f"{value_col}_anomaly"]]
+        flagged = {
+            d.date(): (b, z)
+            for d, b, z in zip(hits["Date"], hits[f"{value_col}_baseline"], hits[f"{value_col}_z"])
+        }
+    shapes = []
+
+    for r in text.index:
+        for c in text.columns:
+            d = text.loc[r, c]
+            if pd.isna(d):
+                text.loc[r, c] = ""
+                hover.loc[r, c] = ""
+            else:
+                day_num = pd.Timestamp(d).day
+                bookings = int(cal_df.loc[cal_df["DateOnly"] == d, "Bookings"].iloc[0])
+                covers = int(cal_df.loc[cal_df["DateOnly"] == d, "Covers"].iloc[0])
+                val = int(pivot.loc[r, c]) if not pd.isna(pivot.loc[r, c]) else 0
+
+                text.loc[r, c] = f"{day_num}<br><b>{val}</b>"
+                hover.loc[r, c] = f"{d}<br>Bookings: {bookings}<br>Covers: {covers}"
+
+                if d in flagged:
+                    typical, z = flagged[d]
+                    direction = "above" if z > 0 else "below"
+                    hover.loc[r, c] += f"<br><b>Unusual:</b> {direction} typical {value_col.lower()} of {typical:.0f} (z={z:+.1f})"
+                    row_pos = list(pivot.index).index(r)
+                    shapes.append(dict(
+                        type="rect", xref="x", yref="y",
+                        x0=c - 0.47, x1=c + 0.47, y0=row_pos - 0.47, y1=row_pos + 0.47,
+                        line=dict(color="#dc2626", width=3),
+                    ))
+
+    fig = go.Figure(
+        go.Heatmap(
+            z=pivot.values,
+            x=weekday_labels,
+            y=[f"W{i+1}" for i in pivot.index],
+            text=text.values,
+            texttemplate="%{text}",
+            hovertext=hover.values,
+            hoverinfo="text",
+            showscale=False,
+            colorscale=colorscale,
+        )
+    )
+
+    fig.update_layout(
+        height=360,
+        margin=dict(l=10, r=10, t=10, b=10),
+        yaxis=dict(autorange="reversed"),
+        paper_bgcolor="white",
+        plot_bgcolor="white",
+        font=dict(color="#6b7280", size=11, family="Inter"),
+        xaxis=dict(side="top"),
+        shapes=shapes,
+    )
+    return fig
+
+def daily_metrics_df(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """Bookings and covers per day, zero-filled over [start, end] (defaults to the data's own range)"""
+    daily = df.groupby("DateOnly").agg(Bookings=("DateOnly", "size"), Covers=("Pax", "sum"))
+    if start is None:
+        start = df["Date"].min()
+    if end is None:
+        end = df["Date"].max()
+    if pd.isna(start) or pd.isna(end):
+        return pd.DataFrame({"Date": pd.to_datetime([]), "Bookings": [], "Covers": []})
+
+    all_days = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq="D")
+    daily = daily.reindex(all_days.date, fill_value=0)
+    return pd.DataFrame({
+        "Date": all_days,
+        "Bookings": daily["Bookings"].to_numpy(dtype=int),
+        "Covers": daily["Covers"].to_numpy(dtype=int),
+    })
+
+def weekly_pivot(df: pd.DataFrame, metric: str, top_n=10) -> pd.DataFrame:
+    """Time slot x day-of-week grid of covers or bookings, time-sorted; top_n=None keeps every slot"""
+    if metric == "Covers":
+        agg = df.groupby(["DayOfWeek", "Time_Label"])["Pax"].sum().reset_index()
+        agg.rename(columns={"Pax": "Value"}, inplace=True)
+    else:
+        agg = df.groupby(["DayOfWeek", "Time_Label"]).size().reset_index(name="Value")
+
+    pivot = agg.pivot(index="Time_Label", columns="DayOfWeek", values="Value").reindex(columns=DOW_ORDER).fillna(0)
+
+    if top_n is not None:
+        top_times = agg.groupby("Time_Label")["Value"].sum().sort_values(ascending=False).head(top_n).index
+        pivot = pivot.loc[pivot.index.isin(top_times)]
+
+    # Sort time labels
+    return pivot.reindex(sorted(pivot.index, key=time_sort_key))
+
+def weekly_view_fig(df: pd.DataFrame, metric: str) -> go.Figure:
+    dow_labels = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+    # Focus on top 10 time slots for better readability
+    pivot = weekly_pivot(df, metric, top_n=10)
+
+    # Clean text values - only show if > 50 to reduce clutter
+    z_values = pivot.values
+    text_values = [[f'{int(val)}' if val > 50 else '' for val in row] for row in z_values]
+
+    fig = go.Figure(
+        data=go.Heatmap(
+            z=z_values,
+            x=dow_labels,
+            y=pivot.index.tolist(),
+            colorscale=[[0, "#eff6ff"], [0.5, "#60a5fa"], [1, "#1e40af"]] if metric == "Covers"
+                      else [[0, "#f0fdf4"], [0.5, "#34d399"], [1, "#166534"]],
+            showscale=False,
+            text=text_values,
+            texttemplate='%{text}',
+            textfont=dict(size=11, family='Inter', color='#1a1d29', weight=600),
+            hovertemplate="%{y}<br>%{x}<br>" + metric + ": %{z}<extra></extra>",
+        )
+    )
+
+    fig.update_layout(
+        height=380,
+        margin=dict(l=80, r=10, t=10, b=40),
+        paper_bgcolor="white",
+        plot_bgcolor="white",
+        font=dict(color="#6b7280", size=11, family="Inter"),
+        yaxis=dict(autorange="reversed", fixedrange=True),
+        xaxis=dict(fixedrange=True)
+    )
+    return fig
+
+def source_clean_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows with a usable Source value (drops blanks and literal 'nan')"""
+    df_clean = df[df["Source"].notna() & (df["Source"].str.strip().str.len() > 0)].copy()
+    return df_clean[df_clean["Source"].str.lower() != 'nan']
+
+def source_mix_fig(df: pd.DataFrame) -> go.Figure:
+    # Get total covers by source, removing any invalid values
+    source_totals = source_clean_df(df).groupby("Source")["Pax"].sum().reset_index()
+    source_totals.columns = ["Source", "Covers"]
+
+    fig_mix = go.Figure(data=[
+        go.Bar(
+            x=source_totals["Source"],
+            y=source_totals["Covers"],
+            marker_color='#3b82f6',
+            marker_line_width=0,
+            text=source_totals["Covers"].astype(int),
+            textposition="outside",
+            textfont=dict(size=11, color='#6b7280', family='Inter')
+        )
+    ])
+
+    fig_mix.update_layout(
+        height=320,
+        margin=dict(l=10, r=10, t=10, b=40),
+        paper_bgcolor="white",
+        plot_bgcolor="white",
+        font=dict(color="#6b7280", size=11, family="Inter"),
+        showlegend=False,
+        xaxis=dict(showgrid=False, showline=False),
+        yaxis=dict(showgrid=True, gridcolor="#f3f4f6", showline=False, zeroline=False, title="Total Covers"),
+    )
+    return fig_mix
+
+def _stacked_source_fig(pivot: pd.DataFrame, title: str, tickangle: int = 0) -> go.Figure:
+    fig = go.Figure()
+
+    for source in pivot.columns:
+        fig.add_trace(go.Bar(
+            x=pivot.index,
+            y=pivot[source],
+            name=source,
+            marker_color='#3b82f6' if source == 'Reservation' else '#f59e0b',
+            text=pivot[source].astype(int),
+            textposition="inside",
+            textfont=dict(size=10, color='white', family='Inter')
+        ))
+
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=13, color='#6b7280')),
+        barmode="stack",
+        height=300,
+        margin=dict(l=10, r=10, t=40, b=40),
+        paper_bgcolor="white",
+        plot_bgcolor="white",
+        font=dict(color="#6b7280", size=10, family="Inter"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        xaxis=dict(showgrid=False, showline=False, tickangle=tickangle),
+        yaxis=dict(showgrid=True, gridcolor="#f3f4f6", showline=False, zeroline=False),
+    )
+    return fig
+
+def source_dow_fig(df: pd.DataFrame) -> go.Figure:
+    # Walk-ins vs Reservations by Day of Week
+    source_dow = source_clean_df(df).groupby(["DayOfWeek", "Source"])["Pax"].sum().reset_index()
+    source_dow_pivot = source_dow.pivot(index="DayOfWeek", columns="Source", values="Pax").reindex(DOW_ORDER).fillna(0)
+    return _stacked_source_fig(source_dow_pivot, "Covers by Day of Week")
+
+def source_time_fig(df: pd.DataFrame) -> go.Figure:
+    # Walk-ins vs Reservations by Time
+    source_time = source_clean_df(df).groupby(["Time_Label", "Source"])["Pax"].sum().reset_index()
+    top_times_source = source_time.groupby("Time_Label")["Pax"].sum().sort_values(ascending=False).head(10).index
+    source_time_filtered = source_time[source_time["Time_Label"].isin(top_times_source)]
+
+    source_time_pivot = source_time_filtered.pivot(index="Time_Label", columns="Source", values="Pax").fillna(0)
+    source_time_pivot = source_time_pivot.reindex(sorted(source_time_pivot.index, key=time_sort_key))
+    return _stacked_source_fig(source_time_pivot, "Covers by Time Slot (Top 10)", tickangle=-45)
+
+def top_summary(df: pd.DataFrame):
+    # Busiest day by covers
+    day_covers = df.groupby("DayOfWeek")["Pax"].sum().reindex(DOW_ORDER)
+    busiest_day_covers = day_covers.idxmax()
+    busiest_day_covers_count = int(day_covers.max())
+
+    # Busiest day by bookings
+    day_bookings = df.groupby("DayOfWeek").size().reindex(DOW_ORDER)
+    busiest_day_bookings = day_bookings.idxmax()
+    busiest_day_bookings_count = int(day_bookings.max())
+
+    # Busiest time by covers
+    time_covers = df.groupby("Time_Label")["Pax"].sum().sort_values(ascending=False)
+    busiest_time_covers = time_covers.index[0] if len(time_covers) else ""
+    busiest_time_covers_count = int(time_covers.iloc[0]) if len(time_covers) else 0
+
+    # Busiest time by bookings
+    time_bookings = df.groupby("Time_Label").size().sort_values(ascending=False)
+    busiest_time_bookings = time_bookings.index[0] if len(time_bookings) else ""
+    busiest_time_bookings_count = int(time_bookings.iloc[0]) if len(time_bookings) else 0
+
+    # Busiest day+time by covers
+    day_time_covers = df.groupby(["DayOfWeek", "Time_Label"])["Pax"].sum().sort_values(ascending=False)
+    if len(day_time_covers) > 0:
+        peak_dow, peak_time = day_time_covers.index[0]
+        peak_covers_count = int(day_time_covers.iloc[0])
+        busiest_day_time_covers = f"{peak_dow} @ {peak_time}"
+    else:
+        busiest_day_time_covers = ""
+        peak_covers_count = 0
+
+    # Busiest day+time by bookings
+    day_time_bookings = df.groupby(["DayOfWeek", "Time_Label"]).size().sort_values(ascending=False)
+    if len(day_time_bookings) > 0:
+        peak_dow_b, peak_time_b = day_time_bookings.index[0]
+        peak_bookings_count = int(day_time_bookings.iloc[0])
+        busiest_day_time_bookings = f"{peak_dow_b} @ {peak_time_b}"
+    else:
+        busiest_day_time_bookings = ""
+        peak_bookings_count = 0
+
+    return {
+        "busiest_day_covers": busiest_day_covers,
+        "busiest_day_covers_count": busiest_day_covers_count,
+        "busiest_day_bookings": busiest_day_bookings,
+        "busiest_day_bookings_count": busiest_day_bookings_count,
+        "busiest_time_covers": busiest_time_covers,
+        "busiest_time_covers_count": busiest_time_covers_count,
+        "busiest_time_bookings": busiest_time_bookings,
+        "busiest_time_bookings_count": busiest_time_bookings_count,
+        "busiest_day_time_covers": busiest_day_time_covers,
+        "busiest_day_time_covers_count": peak_covers_count,
+        "busiest_day_time_bookings": busiest_day_time_bookings,
+        "busiest_day_time_bookings_count": peak_bookings_count,
+    }
+
+def build_month_view(df: pd.DataFrame, anomalies: pd.DataFrame = None) -> dict:
+    """Everything a month tab renders: cleaned frame, headline numbers, calendar and figures.
+
+    anomalies is the full-history table from AnomalyDetector; flagged days in
+    this month are outlined on the calendar heatmaps.
+    """
+    year = int(df["Date"].dt.year.dropna().unique()[-1])
+    month = int(df["Date"].dt.month.dropna().unique()[-1])
+
+    total_bookings = int(len(df))
+    cal_df = month_calendar_df(df, year, month)
+
+    if anomalies is not None:
+        in_month = (anomalies["Date"].dt.year == year) & (anomalies["Date"].dt.month == month)
+        anomalies = anomalies[in_month]
+
+    return {
+        "df": df,
+        "year": year,
+        "month": month,
+        "total_covers": int(df["Pax"].sum()),
+        "total_bookings": total_bookings,
+        "avg_party": float(df["Pax"].mean()) if total_bookings else 0.0,
+        "summary": top_summary(df),
+        "cal_df": cal_df,
+        "anomalies": anomalies,
+        "figures": {
+            "calendar_covers": calendar_heatmap(cal_df, "Covers", COVERS_CALENDAR_COLORS, anomalies),
+            "calendar_bookings": calendar_heatmap(cal_df, "Bookings", BOOKINGS_CALENDAR_COLORS, anomalies),
+            "source_mix": source_mix_fig(df),
+            "source_dow": source_dow_fig(df),
+            "source_time": source_time_fig(df),
+            "weekly_covers": weekly_view_fig(df, "Covers"),
+            "weekly_bookings": weekly_view_fig(df, "Bookings"),
+        },
+    }
+
+def build_once(maxsize: int):
+    """LRU cache that builds each key at most once at a time.
+
+    Like functools.lru_cache, but a caller that misses while another thread
+    is already building the same key waits for that build instead of
+    repeating it -- so a visitor arriving mid-warm-up reuses the warmer's work.
+    """
+    def decorator(fn):
+        cache = OrderedDict()
+        building = {}
+        guard = threading.Lock()
+
+        @wraps(fn)
+        def wrapper(*args):
+            with guard:
+                if args in cache:
+                    cache.move_to_end(args)
+                    return cache[args]
+                lock = building.setdefault(args, threading.Lock())
+
+            with lock:
+                with guard:
+                    if args in cache:
+                        cache.move_to_end(args)
+                        return cache[args]
+                try:
+                    value = fn(*args)
+                    with guard:
+                        cache[args] = value
+                        while len(cache) > maxsize:
+                            cache.popitem(last=False)
+                finally:
+                    with guard:
+                        building.pop(args, None)
+            return value
+
+        def cache_clear():
+            with guard:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+# Cached pipeline. Every entry is keyed by file fingerprints, so a changed
+# CSV simply misses the cache. Returned frames and figures are shared between
+# sessions and threads -- treat them as read-only. Arguments are positional
+# only, since they form the cache key.
+ANOMALY_DETECTOR = AnomalyDetector()
+
+@build_once(maxsize=16)
+def load_month(path: str, fingerprint: tuple) -> pd.DataFrame:
+    return clean_month_df(load_csv(path))
+
+@build_once(maxsize=4)
+def _load_all_months(fingerprints: tuple) -> pd.DataFrame:
+    frames = []
+    for file_name, fp in fingerprints:
+        frames.append(load_month(data_path(file_name), fp))
+    return pd.concat(frames, ignore_index=True)
+
+def load_all_months(month_files: dict = MONTH_FILES) -> pd.DataFrame:
+    """Load and combine all monthly CSV files"""
+    return _load_all_months(month_fingerprints(month_files))
+
+# One entry per month prefix (see months_through), plus the previous generation
+@build_once(maxsize=8)
+def history_anomalies(fingerprints: tuple) -> pd.DataFrame:
+    df = _load_all_months(fingerprints)
+    # Zero-fill through the end of the last month, not its last booking, so
+    # empty closing days are scored the same whether or not a later month is loaded
+    month_end = df["Date"].max() + pd.offsets.MonthEnd(0)
+    # The detector only re-scores days from the first changed one onward
+    return ANOMALY_DETECTOR.update(daily_metrics_df(df, end=month_end))
+
+def current_anomalies(month_files: dict = MONTH_FILES) -> pd.DataFrame:
+    """Robust z-score anomaly table over the full daily history"""
+    return history_anomalies(month_fingerprints(month_files))
+
+@build_once(maxsize=8)
+def history_trend(fingerprints: tuple, grain: str) -> pd.DataFrame:
+    return trend_series(_load_all_months(fingerprints), grain)
+
+def current_trend(grain: str, month_files: dict = MONTH_FILES) -> pd.DataFrame:
+    """Full-history trend series at "Daily" or "Time slot" grain"""
+    return history_trend(month_fingerprints(month_files), grain)
+
+@build_once(maxsize=16)
+def month_view(path: str, fingerprint: tuple, history: tuple = ()) -> dict:
+    """history: fingerprints of the months up to and including this one (see months_through)"""
+    return build_month_view(load_month(path, fingerprint), history_anomalies(history) if history else None)
+
+def months_through(file_name: str, month_files: dict = MONTH_FILES) -> dict:
+    """month_files up to and including file_name (month_files is in chronological order)"""
+    names = list(month_files)
+    files = list(month_files.values())
+    keep = files.index(file_name) + 1
+    return {name: f for name, f in zip(names[:keep], files[:keep])}
+
+def current_month_view(file_name: str, month_files: dict = MONTH_FILES) -> dict:
+    # Anomaly scores only look back in time, so a month's view depends on its
+    # own file and earlier ones -- editing December doesn't rebuild October
+    path = data_path(file_name)
+    return month_view(path, file_fingerprint(path), month_fingerprints(months_through(file_name, month_files)))
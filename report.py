@@ -0,0 +1,271 @@
+"""Headless monthly report exporter.
+
+Renders every month (or every venue x month) to standalone HTML and/or JSON
+using the same pipeline as the dashboard, one month per worker process.
+Reports whose input fingerprint is unchanged since the last run are skipped.
+
+    python report.py --out reports
+    python report.py --out reports --by-venue --format json --workers 4
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pipeline import MONTH_FILES, build_month_view, data_path, load_csv, clean_month_df
+
+# Bump when the report layout changes so existing outputs are regenerated
+REPORT_VERSION = "1"
+
+VENUE_COL = "Venue"
+
+MANIFEST_NAME = "manifest.json"
+
+FIGURE_TITLES = [
+    ("calendar_covers", "Calendar View - Covers"),
+    ("calendar_bookings", "Calendar View - Bookings"),
+    ("source_mix", "Walk-ins vs Reservations"),
+    ("source_dow", "Source Analysis - Day of Week"),
+    ("source_time", "Source Analysis - Time Slot"),
+    ("weekly_covers", "Weekly View - Covers"),
+    ("weekly_bookings", "Weekly View - Bookings"),
+]
+
+
+def slugify(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", str(value).lower()).strip("-") or "unknown"
+
+def unique_slugs(values: list) -> list:
+    """Slug per value; values that slugify alike ("Main St", "Main-St") get -2, -3, ... suffixes"""
+    taken = set()
+    slugs = []
+    for value in values:
+        base = slug = slugify(value)
+        n = 2
+        while slug in taken:
+            slug = f"{base}-{n}"
+            n += 1
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+def input_fingerprint(file_name: str, formats: tuple, by_venue: bool, plotlyjs: str) -> str:
+    """Content hash of the CSV plus everything that changes the rendered output"""
+    h = hashlib.sha256()
+    with open(data_path(file_name), "rb") as f:
+        h.update(f.read())
+    h.update(json.dumps([REPORT_VERSION, sorted(formats), by_venue, plotlyjs]).encode())
+    return h.hexdigest()
+
+def report_json(view: dict, label: str, venue: str = "") -> dict:
+    cal_df = view["cal_df"]
+    source_totals = view["df"].groupby("Source").agg(Covers=("Pax", "sum"), Bookings=("Source", "size"))
+    return {
+        "month": label,
+        "venue": venue,
+        "year": view["year"],
+        "month_number": view["month"],
+        "total_covers": view["total_covers"],
+        "total_bookings": view["total_bookings"],
+        "avg_party": round(view["avg_party"], 2),
+        "summary": view["summary"],
+        "daily": [
+            {"date": str(r.DateOnly), "bookings": int(r.Bookings), "covers": int(r.Covers)}
+            for r in cal_df.itertuples()
+        ],
+        "sources": {
+            str(source): {"covers": int(row.Covers), "bookings": int(row.Bookings)}
+            for source, row in source_totals.iterrows()
+        },
+    }
+
+def report_html(view: dict, label: str, venue: str = "", plotlyjs: str = "inline") -> str:
+    title = f"{label} - {venue}" if venue else label
+    summary = view["summary"]
+    metrics = [
+        ("Total Covers", f"{view['total_covers']:,}"),
+        ("Total Bookings", f"{view['total_bookings']:,}"),
+        ("Average Party Size", f"{view['avg_party']:.2f}"),
+        ("Busiest Day (Covers)", f"{summary['busiest_day_covers']} ({summary['busiest_day_covers_count']:,})"),
+        ("Busiest Time (Covers)", f"{summary['busiest_time_covers']} ({summary['busiest_time_covers_count']:,})"),
+        ("Peak Slot", f"{summary['busiest_day_time_covers']} ({summary['busiest_day_time_covers_count']:,})"),
+        ("Busiest Day (Bookings)", f"{summary['busiest_day_bookings']} ({summary['busiest_day_bookings_count']:,})"),
+        ("Busiest Time (Bookings)", f"{summary['busiest_time_bookings']} ({summary['busiest_time_bookings_count']:,})"),
+    ]
+    metric_cells = "".join(
+        f'<div class="metric"><div class="label">{html.escape(k)}</div><div class="value">{html.escape(v)}</div></div>'
+        for k, v in metrics
+    )
+
+    # Embed plotly.js once so the file opens offline (e.g. as an email attachment);
+    # "cdn" keeps files small at the cost of needing a network connection
+    charts = []
+    for i, (key, chart_title) in enumerate(FIGURE_TITLES):
+        include_js = (True if plotlyjs == "inline" else "cdn") if i == 0 else False
+        fig_html = view["figures"][key].to_html(full_html=False, include_plotlyjs=include_js)
+        charts.append(f'<div class="card"><div class="card-title">{html.escape(chart_title)}</div>{fig_html}</div>')
+
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Seated Report - {html.escape(title)}</title>
+<style>
+  body {{ font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif; background: #f8f9fb; color: #111827; max-width: 1200px; margin: 2rem auto; padding: 0 1rem; }}
+  h1 {{ font-size: 2rem; font-weight: 700; letter-spacing: -0.02em; margin-bottom: 1.5rem; }}
+  .metrics {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem; margin-bottom: 1.5rem; }}
+  .metric, .card {{ background: white; border: 1px solid #e5e7eb; border-radius: 12px; padding: 1.25rem; }}
+  .label {{ font-size: 0.75rem; font-weight: 700; color: #6b7280; text-transform: uppercase; letter-spacing: 0.05em; }}
+  .value {{ font-size: 1.4rem; font-weight: 800; }}
+  .card {{ margin-bottom: 1.5rem; }}
+  .card-title {{ font-size: 1rem; font-weight: 700; margin-bottom: 0.75rem; }}
+</style>
+</head>
+<body>
+<h1>Seated Performance Report - {html.escape(title)}</h1>
+<div class="metrics">{metric_cells}</div>
+{''.join(charts)}
+</body>
+</html>
+"""
+
+def render_month(label: str, file_name: str, out_dir: str, formats: tuple, by_venue: bool,
+                 plotlyjs: str = "inline") -> list:
+    """Worker: render one month (and its venue splits) and return the paths written"""
+    df = clean_month_df(load_csv(data_path(file_name)))
+    stem = slugify(label)
+
+    if by_venue and VENUE_COL in df.columns:
+        venues = sorted(df[VENUE_COL].dropna().astype(str).unique())
+        parts = [(venue, os.path.join(stem, slug)) for venue, slug in zip(venues, unique_slugs(venues))]
+        frames = {venue: df[df[VENUE_COL].astype(str) == venue] for venue, _ in parts}
+    else:
+        parts = [("", stem)]
+        frames = {"": df}
+
+    # Everything goes to .tmp files first and is only swapped in once the whole
+    # month rendered, so a failure never leaves a half-updated report behind
+    staged = []
+    try:
+        for venue, rel_path in parts:
+            view = build_month_view(frames[venue])
+            base = os.path.join(out_dir, rel_path)
+            os.makedirs(os.path.dirname(base), exist_ok=True)
+            if "json" in formats:
+                staged.append(base + ".json")
+                with open(base + ".json.tmp", "w") as f:
+                    json.dump(report_json(view, label, venue), f, indent=2)
+            if "html" in formats:
+                staged.append(base + ".html")
+                with open(base + ".html.tmp", "w") as f:
+                    f.write(report_html(view, label, venue, plotlyjs))
+    except BaseException:
+        remove_outputs([path + ".tmp" for path in staged])
+        raise
+
+    for path in staged:
+        os.replace(path + ".tmp", path)
+    return staged
+
+def remove_outputs(paths: list):
+    """Delete outputs (and venue folders left empty) that are no longer part of a month's report"""
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    for folder in {os.path.dirname(p) for p in paths}:
+        try:
+            os.rmdir(folder)
+        except OSError:
+            pass
+
+def load_manifest(out_dir: str) -> dict:
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(out_dir: str, manifest: dict):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def export_reports(out_dir: str, formats: tuple = ("html", "json"), by_venue: bool = False,
+                   workers: int = None, force: bool = False, plotlyjs: str = "inline",
+                   month_files: dict = MONTH_FILES) -> dict:
+    """Render all months across a process pool; returns {"rendered": [...], "skipped": [...], "failed": {...}}"""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+
+    pending = {}
+    skipped = []
+    for label, file_name in month_files.items():
+        fingerprint = input_fingerprint(file_name, formats, by_venue, plotlyjs)
+        entry = manifest.get(label, {})
+        outputs_exist = all(os.path.exists(p) for p in entry.get("outputs", []))
+        if not force and entry.get("fingerprint") == fingerprint and outputs_exist:
+            skipped.append(label)
+        else:
+            pending[label] = (file_name, fingerprint)
+
+    rendered, failed = [], {}
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(render_month, label, file_name, out_dir, formats, by_venue, plotlyjs): label
+                for label, (file_name, _) in pending.items()
+            }
+            for future in as_completed(futures):
+                label = futures[future]
+                try:
+                    outputs = future.result()
+                except Exception as e:
+                    # The previous report and its manifest entry stay as they were
+                    failed[label] = str(e)
+                    continue
+                # Venues that disappeared (or renamed slugs) would otherwise leave stale files behind
+                previous = manifest.get(label, {}).get("outputs", [])
+                remove_outputs([p for p in previous if p not in outputs])
+                manifest[label] = {"fingerprint": pending[label][1], "outputs": outputs}
+                rendered.append(label)
+        save_manifest(out_dir, manifest)
+
+    return {"rendered": rendered, "skipped": skipped, "failed": failed}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export static Seated reports for every month")
+    parser.add_argument("--out", default="reports", help="output directory (default: reports)")
+    parser.add_argument("--format", choices=["html", "json"], action="append", dest="formats",
+                        help="output format, repeatable (default: html and json)")
+    parser.add_argument("--by-venue", action="store_true", help=f"one report per venue x month (needs a '{VENUE_COL}' column)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--plotlyjs", choices=["inline", "cdn"], default="inline",
+                        help="embed plotly.js in each HTML file or load it from the CDN (default: inline)")
+    parser.add_argument("--force", action="store_true", help="re-render even if inputs are unchanged")
+    args = parser.parse_args(argv)
+
+    formats = tuple(sorted(set(args.formats or ["html", "json"])))
+    started = time.perf_counter()
+    result = export_reports(args.out, formats, args.by_venue, args.workers, args.force, args.plotlyjs)
+    elapsed = time.perf_counter() - started
+
+    for label in result["rendered"]:
+        print(f"rendered  {label}")
+    for label in result["skipped"]:
+        print(f"unchanged {label}")
+    for label, error in result["failed"].items():
+        print(f"FAILED    {label}: {error}")
+    print(f"{len(result['rendered'])} rendered, {len(result['skipped'])} skipped, "
+          f"{len(result['failed'])} failed in {elapsed:.1f}s")
+    return 1 if result["failed"] else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+GRAINS = ["Auto", "Daily", "Time slot"]
+
+# Auto switches to per-slot points once the window is at most this many days
+AUTO_SLOT_MAX_DAYS = 31
+
+# Hard cap on points sent across all traces, whatever the history length or width
+TREND_MAX_POINTS = 2000
+DEFAULT_WIDTH_PX = 1200
+
+# SVG scatter gets sluggish past a few thousand points; switch to WebGL
+WEBGL_MIN_POINTS = 1000
+
+METRIC_COLORS = {"Covers": "#3b82f6", "Bookings": "#22c55e"}
+
+
+def trend_series(df: pd.DataFrame, grain: str) -> pd.DataFrame:
+    """Covers and bookings per day (zero-filled) or per day + time slot, indexed by Time"""
+    if df.empty:
+        return pd.DataFrame({"Time": pd.to_datetime([]), "Covers": [], "Bookings": []})
+
+    if grain == "Daily":
+        key = df["Date"].dt.normalize()
+    else:
+        # Parse each distinct slot label once, then broadcast as an offset
+        labels = pd.Series(df["Time_Label"].unique())
+        parsed = pd.to_datetime(labels, format="mixed", errors="coerce")
+        offsets = dict(zip(labels, (parsed - parsed.dt.normalize()).fillna(pd.Timedelta(0))))
+        key = df["Date"].dt.normalize() + df["Time_Label"].map(offsets)
+
+    series = df.groupby(key).agg(Covers=("Pax", "sum"), Bookings=("Pax", "size"))
+    series.index.name = "Time"
+
+    if grain == "Daily":
+        series = series.reindex(pd.date_range(series.index.min(), series.index.max(), freq="D"), fill_value=0)
+        series.index.name = "Time"
+
+    return series.reset_index()
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of n_out points that keep the line's visual shape.
+
+    The first and last points are always kept. Every other bucket keeps the
+    point forming the largest triangle with the previously kept point and the
+    mean of the next bucket, so spikes and dips survive downsampling.
+    """
+    n = len(x)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    n_out = max(n_out, 3)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+def resolve_grain(grain: str, start, end) -> str:
+    if grain != "Auto":
+        return grain
+    days = (pd.Timestamp(end) - pd.Timestamp(start)).days + 1
+    return "Time slot" if days <= AUTO_SLOT_MAX_DAYS else "Daily"
+
+def point_budget(width_px: int = DEFAULT_WIDTH_PX, n_traces: int = 1) -> int:
+    """Points per trace: about one per horizontal pixel, with the total capped at TREND_MAX_POINTS"""
+    n_traces = max(n_traces, 1)
+    return int(min(TREND_MAX_POINTS // n_traces, max(width_px, 100)))
+
+def window_series(series: pd.DataFrame, start, end) -> pd.DataFrame:
+    end = pd.Timestamp(end) + pd.Timedelta(days=1)
+    return series[(series["Time"] >= pd.Timestamp(start)) & (series["Time"] < end)]
+
+def trend_fig(series: pd.DataFrame, metrics: list, grain: str, width_px: int = DEFAULT_WIDTH_PX) -> tuple:
+    """Line chart of the windowed series, each trace LTTB-downsampled to the point budget.
+
+    width_px is the chart's rendered width; at most TREND_MAX_POINTS points
+    are sent in total however many metrics are plotted.
+    Returns (figure, points sent, points in window).
+    """
+    budget = point_budget(width_px, len(metrics))
+    x_all = series["Time"].to_numpy()
+    x_num = series["Time"].astype("int64").to_numpy() / 1e9
+
+    fig = go.Figure()
+    sent = 0
+    for metric in metrics:
+        y_all = series[metric].to_numpy(dtype=float)
+        keep = lttb(x_num, y_all, budget)
+        sent += len(keep)
+
+        trace = go.Scattergl if len(keep) >= WEBGL_MIN_POINTS else go.Scatter
+        fig.add_trace(trace(
+            x=x_all[keep],
+            y=y_all[keep],
+            name=metric,
+            mode="lines" if grain == "Daily" or len(keep) > 200 else "lines+markers",
+            line=dict(color=METRIC_COLORS.get(metric, "#6b7280"), width=1.5),
+            yaxis="y2" if metric == "Bookings" and len(metrics) > 1 else "y",
+            hovertemplate="%{x}<br>" + metric + ": %{y:,.0f}<extra></extra>",
+        ))
+
+    fig.update_layout(
+        height=380,
+        margin=dict(l=10, r=10, t=10, b=40),
+        paper_bgcolor="white",
+        plot_bgcolor="white",
+        font=dict(color="#6b7280", size=11, family="Inter"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified",
+        xaxis=dict(showgrid=False, showline=False),
+        yaxis=dict(showgrid=True, gridcolor="#f3f4f6", showline=False, zeroline=False, title=metrics[0] if metrics else ""),
+        yaxis2=dict(overlaying="y", side="right", showgrid=False, zeroline=False, title="Bookings"),
+    )
+    if len(metrics) < 2:
+        fig.update_layout(yaxis2=dict(visible=False))
+    return fig, sent, len(series) * len(metrics)
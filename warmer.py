@@ -0,0 +1,66 @@
+import threading
+import time
+import traceback
+from datetime import datetime
+
+from pipeline import MONTH_FILES, current_month_view, current_trend, load_all_months, month_fingerprints
+
+POLL_SECONDS = 5
+
+
+class CacheWarmer(threading.Thread):
+    """Background thread that watches the month CSVs and rebuilds the cached
+    pipeline (cleaned frames, aggregates and figures) whenever one changes,
+    so the first visitor after a data refresh doesn't pay for it."""
+
+    def __init__(self, month_files: dict = MONTH_FILES, poll_seconds: float = POLL_SECONDS):
+        super().__init__(name="seated-cache-warmer", daemon=True)
+        self.month_files = month_files
+        self.poll_seconds = poll_seconds
+        self.status = "starting"
+        self.last_refresh = None
+        self.last_duration = 0.0
+        self.last_error = ""
+        self._seen = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            fingerprints = month_fingerprints(self.month_files)
+            # A failed warm leaves _seen alone so the next poll retries it
+            if fingerprints != self._seen and self.warm():
+                self._seen = fingerprints
+            self._stop_event.wait(self.poll_seconds)
+
+    def warm(self) -> bool:
+        self.status = "warming"
+        started = time.perf_counter()
+        try:
+            load_all_months(self.month_files)
+            for file_name in self.month_files.values():
+                current_month_view(file_name, self.month_files)
+            for grain in ("Daily", "Time slot"):
+                current_trend(grain, self.month_files)
+        except Exception as e:
+            self.status = "error"
+            self.last_error = f"{e}"
+            traceback.print_exc()
+            return False
+        self.last_duration = time.perf_counter() - started
+        self.last_refresh = datetime.now()
+        self.last_error = ""
+        self.status = "idle"
+        return True
+
+    def stop(self):
+        self._stop_event.set()
+
+    def status_line(self) -> str:
+        if self.status == "error":
+            return f"Cache warmer: error ({self.last_error})"
+        if self.last_refresh is None:
+            return f"Cache warmer: {self.status}"
+        return (
+            f"Cache warmer: {self.status} · last refresh {self.last_refresh:%Y-%m-%d %H:%M:%S} "
+            f"({self.last_duration:.1f}s)"
+        )